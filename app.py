@@ -1,31 +1,294 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
 import os
+import fcntl
+import hashlib
+import math
+import tempfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urlencode, unquote
 from dotenv import load_dotenv
-import json
+import orjson
+import redis
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import MappingProxyType
+from cachetools import TTLCache
 
 load_dotenv()
 
+
+class OrjsonProvider(JSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 CLIENT_ID = os.getenv("CLIENT_ID")
 CLIENT_SECRET = os.getenv("CLIENT_SECRET")
 REDIRECT_URI = "http://localhost:5000/callback"
 SCOPE = "ZohoCRM.modules.ALL,ZohoCRM.settings.modules.READ,ZohoCRM.settings.fields.READ"
 TOKEN_FILE = "tokens.json"
+TOKEN_URL = "https://accounts.zoho.in/oauth/v2/token"
+FIELDS_PATH = "/crm/v3/settings/fields"
+CUSTOMERS_PATH = "/crm/v3/Customers"
+ORDERS_PATH = "/crm/v3/Cart_Orders"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Everything in the consent URL is fixed at boot, so build the /auth response once.
+_AUTH_PARAMS = {
+    "scope": SCOPE,
+    "client_id": CLIENT_ID,
+    "response_type": "code",
+    "access_type": "offline",
+    "redirect_uri": REDIRECT_URI,
+    "prompt": "consent"
+}
+_AUTH_URL = unquote(f"https://accounts.zoho.in/oauth/v2/auth?{urlencode(_AUTH_PARAMS)}")
+_AUTH_RESPONSE = orjson.dumps({"auth_url": _AUTH_URL})
+
+# One pooled session for every outbound Zoho call so keep-alive connections
+# to accounts.zoho.in and the API domain are reused across requests.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=3,
+        # A read timeout is final: retrying it would stretch one stuck call
+        # well past _TIMEOUT.
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        # Zoho's Retry-After can ask for a minute or more and urllib3 would
+        # sleep for all of it; rely on the short backoff instead. Each call is
+        # then bounded by 4 attempts of _TIMEOUT plus about 1.2 s of backoff.
+        respect_retry_after_header=False,
+        raise_on_status=False
+    )
+))
+
+# Sent on every Zoho call; set once on the session so each request only adds
+# its Authorization header.
+_BASE_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "User-Agent": "zoho-integration/1.0"
+}
+SESSION.headers.update(_BASE_HEADERS)
+
+# Never let a stuck Zoho socket pin a worker: bound connect and read time, and
+# once calls keep failing, stop sending more until Zoho has had time to recover.
+_TIMEOUT = (3.05, 10)
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    # Only the failure counters are locked; the guarded call runs outside the
+    # lock so concurrent Zoho calls are never serialised behind each other.
+    def __init__(self, fail_max, reset_timeout):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError("Zoho circuit breaker is open")
+            # Half-open: let calls through again, but one more failure re-opens.
+            self._opened_at = None
+            self._failures = self.fail_max - 1
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+
+
+_ZOHO_BREAKER = CircuitBreaker(fail_max=5, reset_timeout=30)
+
+
+def _zoho_call(method, url, **kwargs):
+    _ZOHO_BREAKER.before_call()
+    try:
+        response = SESSION.request(method, url, timeout=_TIMEOUT, **kwargs)
+    except requests.RequestException:
+        _ZOHO_BREAKER.record_failure()
+        raise
+    # Count throttling and server errors that outlived the adapter's retries
+    # as breaker failures, not just transport errors.
+    if response.status_code >= 500 or response.status_code == 429:
+        _ZOHO_BREAKER.record_failure()
+    else:
+        _ZOHO_BREAKER.record_success()
+    return response
+
+
+# Zoho serves at most 200 records per page and 2000 records without a
+# page_token, hence the page cap. Listings fan their pages out over a small
+# per-request pool, and the process-wide semaphore keeps no more than
+# PAGE_FETCH_CONCURRENCY page fetches in flight against the API quota across
+# every request the worker is serving.
+PER_PAGE = 200
+MAX_PAGES = 10
+PAGE_FETCH_CONCURRENCY = 10
+_PAGE_FETCH_SLOTS = threading.BoundedSemaphore(PAGE_FETCH_CONCURRENCY)
+_LIST_PARAMS = MappingProxyType({"per_page": PER_PAGE})
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Field schemas change rarely; keep the joined field list per
+# (module, api_domain) for 10 minutes instead of fetching it on every listing.
+FIELDS_CACHE_TTL = 600
+_FIELDS_CACHE = TTLCache(maxsize=32, ttl=FIELDS_CACHE_TTL)
+_FIELDS_CACHE_LOCK = threading.Lock()
+
+# Optional Redis cache shared across workers for listing responses and field
+# lists. Caching is skipped when REDIS_URL is unset.
+REDIS_URL = os.getenv("REDIS_URL")
+RESPONSE_CACHE_TTL = 30
+# Short socket timeouts so a hung Redis degrades to a cache miss instead of
+# holding the request.
+REDIS_TIMEOUT = 0.25
+_REDIS = redis.Redis(
+    connection_pool=redis.ConnectionPool.from_url(
+        REDIS_URL,
+        max_connections=32,
+        socket_timeout=REDIS_TIMEOUT,
+        socket_connect_timeout=REDIS_TIMEOUT
+    )
+) if REDIS_URL else None
+
+# Access tokens live about an hour; hold the current one in memory and only go
+# back to the token endpoint when it is close to expiry or Zoho rejects it.
+TOKEN_EXPIRY_MARGIN = 60
+_TOKEN = {"access_token": None, "api_domain": None, "expires_at": 0}
+# Serialises refreshes so concurrent requests that find the token stale share
+# one call to the token endpoint instead of each making their own. The thread
+# lock covers requests within a worker; a flock on TOKEN_LOCK_FILE covers the
+# other gunicorn workers, which pick the new token up from TOKEN_FILE.
+_REFRESH_LOCK = threading.Lock()
+TOKEN_LOCK_FILE = TOKEN_FILE + ".lock"
+
+# Parsed contents of TOKEN_FILE; the file is only re-read when it is replaced
+# or its mtime moves.
+_TOKENS = None
+_TOKENS_STAT = None
 
 
 def save_tokens(data):
-    with open(TOKEN_FILE, "w") as f:
-        json.dump(data, f)
+    global _TOKENS, _TOKENS_STAT
+    # Write to a temp file and swap it in so a crash mid-write never leaves a
+    # truncated token store behind. The temp name is unique per writer so
+    # concurrent saves from other workers cannot clobber each other's file.
+    fd, tmp_file = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(TOKEN_FILE)),
+        prefix=os.path.basename(TOKEN_FILE) + ".",
+        suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, TOKEN_FILE)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+    st = os.stat(TOKEN_FILE)
+    _TOKENS = data
+    _TOKENS_STAT = (st.st_ino, st.st_mtime_ns)
 
 
 def load_tokens():
-    if os.path.exists(TOKEN_FILE):
-        with open(TOKEN_FILE, "r") as f:
-            return json.load(f)
-    return {}
+    global _TOKENS, _TOKENS_STAT
+    try:
+        st = os.stat(TOKEN_FILE)
+    except FileNotFoundError:
+        return {}
+    if _TOKENS is None or (st.st_ino, st.st_mtime_ns) != _TOKENS_STAT:
+        with open(TOKEN_FILE, "rb") as f:
+            _TOKENS = orjson.loads(f.read())
+        _TOKENS_STAT = (st.st_ino, st.st_mtime_ns)
+    return _TOKENS
+
+
+@contextmanager
+def token_file_lock():
+    with open(TOKEN_LOCK_FILE, "a") as lock_file:
+        # Poll rather than block in flock so a gevent worker keeps serving its
+        # other requests while another process holds the lock.
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def cache_get(key):
+    if _REDIS is None:
+        return None
+    try:
+        return _REDIS.get(key)
+    except redis.RedisError:
+        return None
+
+
+def cache_set(key, ttl, value):
+    if _REDIS is None:
+        return
+    try:
+        _REDIS.setex(key, ttl, value)
+    except redis.RedisError:
+        pass
+
+
+def cache_delete(key):
+    if _REDIS is None:
+        return
+    try:
+        _REDIS.delete(key)
+    except redis.RedisError:
+        pass
+
+
+def token_expires_at(token_data):
+    return time.time() + int(token_data.get("expires_in", 3600))
+
+
+def cache_access_token(token_store):
+    _TOKEN["access_token"] = token_store.get("access_token")
+    _TOKEN["api_domain"] = token_store.get("api_domain")
+    _TOKEN["expires_at"] = token_store.get("expires_at", 0)
 
 
 def refresh_access_token():
@@ -33,9 +296,8 @@ def refresh_access_token():
     refresh_token = token_store.get("refresh_token")
 
     if not refresh_token:
-        return None, "No refresh token found. Please authenticate via /auth first."
+        return None, None, "No refresh token found. Please authenticate via /auth first."
 
-    token_url = "https://accounts.zoho.in/oauth/v2/token"
     refresh_params = {
         "grant_type": "refresh_token",
         "client_id": CLIENT_ID,
@@ -43,33 +305,89 @@ def refresh_access_token():
         "refresh_token": refresh_token
     }
 
-    resp = requests.post(token_url, data=refresh_params)
-    refresh_data = resp.json()
+    resp = _zoho_call("POST", TOKEN_URL, data=refresh_params)
+    # 5xx and 429 replies come back from _zoho_call and may not be JSON.
+    try:
+        refresh_data = orjson.loads(resp.content)
+    except orjson.JSONDecodeError:
+        return None, None, f"Failed to refresh access token (status {resp.status_code})."
 
     if "access_token" not in refresh_data or "api_domain" not in refresh_data:
-        return None, refresh_data.get("error", "Failed to refresh access token.")
-
-    token_store["access_token"] = refresh_data["access_token"]
-    token_store["api_domain"] = refresh_data["api_domain"]
+        return None, None, refresh_data.get("error", "Failed to refresh access token.")
+
+    # Persist the new access token so the other workers reuse it instead of
+    # each minting their own.
+    token_store = {
+        **token_store,
+        "refresh_token": refresh_data.get("refresh_token", refresh_token),
+        "access_token": refresh_data["access_token"],
+        "api_domain": refresh_data["api_domain"],
+        "expires_at": token_expires_at(refresh_data)
+    }
     save_tokens(token_store)
+    cache_access_token(token_store)
+
+    return _TOKEN["access_token"], _TOKEN["api_domain"], None
 
-    return refresh_data["access_token"], None
+
+def cached_token_usable(rejected_token):
+    access_token = _TOKEN["access_token"]
+    return (access_token and access_token != rejected_token
+            and time.time() < _TOKEN["expires_at"] - TOKEN_EXPIRY_MARGIN)
+
+
+def get_access_token(rejected_token=None):
+    if cached_token_usable(rejected_token):
+        return _TOKEN["access_token"], _TOKEN["api_domain"], None
+
+    # Another worker may already have stored a fresh token.
+    cache_access_token(load_tokens())
+    if cached_token_usable(rejected_token):
+        return _TOKEN["access_token"], _TOKEN["api_domain"], None
+
+    with _REFRESH_LOCK, token_file_lock():
+        # Another request may have refreshed while we waited for the lock.
+        cache_access_token(load_tokens())
+        if cached_token_usable(rejected_token):
+            return _TOKEN["access_token"], _TOKEN["api_domain"], None
+        return refresh_access_token()
+
+
+def call_with_retry(method, path, **kwargs):
+    access_token, api_domain, err = get_access_token()
+    if err:
+        return None, err
+
+    extra_headers = kwargs.pop("headers", {})
+    for attempt in range(2):
+        headers = {
+            "Authorization": f"Zoho-oauthtoken {access_token}",
+            **extra_headers
+        }
+        response = _zoho_call(method, api_domain + path, headers=headers, **kwargs)
+        if response.status_code != 401 or attempt:
+            return response, None
+
+        # Token revoked or expired early; refresh once and replay.
+        response.close()
+        access_token, api_domain, err = get_access_token(rejected_token=access_token)
+        if err:
+            return None, err
+
+
+@app.errorhandler(CircuitOpenError)
+def zoho_unavailable(e):
+    return jsonify({"error": "Zoho is unavailable, try again shortly"}), 503
+
+
+@app.errorhandler(requests.RequestException)
+def zoho_request_failed(e):
+    return jsonify({"error": "Request to Zoho failed", "details": str(e)}), 502
 
 
 @app.route("/auth")
 def authorize():
-    base_url = "https://accounts.zoho.in/oauth/v2/auth"
-    params = {
-        "scope": SCOPE,
-        "client_id": CLIENT_ID,
-        "response_type": "code",
-        "access_type": "offline",
-        "redirect_uri": REDIRECT_URI,
-        "prompt": "consent"
-    }
-    auth_url = f"{base_url}?{urlencode(params)}"
-    readable_url = unquote(auth_url)
-    return jsonify({"auth_url": readable_url})
+    return Response(_AUTH_RESPONSE, mimetype="application/json")
 
 
 @app.route("/callback")
@@ -78,7 +396,6 @@ def callback():
     if not code:
         return jsonify({"error": "Authorization code not found"}), 400
 
-    token_url = "https://accounts.zoho.in/oauth/v2/token"
     auth_params = {
         "grant_type": "authorization_code",
         "client_id": CLIENT_ID,
@@ -88,8 +405,8 @@ def callback():
     }
 
     try:
-        auth_response = requests.post(token_url, data=auth_params)
-        auth_data = auth_response.json()
+        auth_response = _zoho_call("POST", TOKEN_URL, data=auth_params)
+        auth_data = orjson.loads(auth_response.content)
 
         refresh_token = auth_data.get("refresh_token")
         access_token = auth_data.get("access_token")
@@ -105,68 +422,192 @@ def callback():
             "refresh_token": refresh_token,
             "access_token": access_token,
             "api_domain": api_domain,
+            "expires_at": token_expires_at(auth_data),
         }
-        save_tokens(token_store)
+        # Hold the refresh locks so a refresh in flight cannot overwrite the
+        # new refresh token with the old one.
+        with _REFRESH_LOCK, token_file_lock():
+            save_tokens(token_store)
+            cache_access_token(token_store)
 
         return jsonify({
             "auth_response": auth_data,
             "note": "Tokens fetched and saved successfully."
         })
 
+    except CircuitOpenError:
+        raise
     except Exception as e:
         return jsonify({"error": "Failed to process callback", "details": str(e)}), 500
 
 
-def get_module_fields(access_token, api_domain, module_api_name):
-    url = f"{api_domain}/crm/v3/settings/fields"
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}"
-    }
+def get_module_fields(module_api_name):
     params = {
         "module": module_api_name
     }
-    response = requests.get(url, headers=headers, params=params)
+    response, err = call_with_retry("GET", FIELDS_PATH, params=params)
+    if err:
+        return None, err
     if response.status_code != 200:
         return None, response.text
-    data = response.json()
+    data = orjson.loads(response.content)
     if "fields" not in data:
         return None, "No fields info found"
     field_names = [field["api_name"] for field in data["fields"]]
     return field_names, None
 
 
+def fields_cache_key(api_domain, module_api_name):
+    return f"zoho:fields:{module_api_name}:{api_domain}"
+
+
+def get_fields_param(api_domain, module_api_name):
+    cache_key = (module_api_name, api_domain)
+    with _FIELDS_CACHE_LOCK:
+        fields_param = _FIELDS_CACHE.get(cache_key)
+    if fields_param is not None:
+        return fields_param, None
+
+    cached = cache_get(fields_cache_key(api_domain, module_api_name))
+    if cached is not None:
+        fields_param = cached.decode()
+    else:
+        fields, err = get_module_fields(module_api_name)
+        if err:
+            return None, err
+        fields_param = ",".join(fields)
+        cache_set(fields_cache_key(api_domain, module_api_name), FIELDS_CACHE_TTL,
+                  fields_param)
+
+    with _FIELDS_CACHE_LOCK:
+        _FIELDS_CACHE[cache_key] = fields_param
+    return fields_param, None
+
+
+def invalidate_fields_param(api_domain, module_api_name):
+    with _FIELDS_CACHE_LOCK:
+        _FIELDS_CACHE.pop((module_api_name, api_domain), None)
+    cache_delete(fields_cache_key(api_domain, module_api_name))
+
+
+def count_record_pages(path):
+    with _PAGE_FETCH_SLOTS:
+        response, err = call_with_retry("GET", path + "/actions/count")
+    if err or response.status_code != 200:
+        return None
+    try:
+        count = orjson.loads(response.content).get("count")
+    except orjson.JSONDecodeError:
+        return None
+    if count is None:
+        return None
+    return max(math.ceil(count / PER_PAGE), 1)
+
+
+def has_more_records(page_data):
+    return page_data is not None and page_data.get("info", {}).get("more_records", False)
+
+
+def fetch_record_pages(path, fields_param, pages):
+    # A single page is piped straight through to the client, so leave the body
+    # on the socket until the handler reads it. Otherwise each page is parsed
+    # once here and the parsed body travels with its response.
+    stream = pages == 1
+
+    def fetch_page(page):
+        params = {**_LIST_PARAMS, "fields": fields_param, "page": page}
+        with _PAGE_FETCH_SLOTS:
+            response, err = call_with_retry("GET", path, params=params, stream=stream)
+        page_data = None
+        if not stream and not err and response.status_code == 200:
+            page_data = orjson.loads(response.content)
+        return response, page_data, err
+
+    if pages == 1:
+        return [fetch_page(1)]
+
+    with ThreadPoolExecutor(max_workers=PAGE_FETCH_CONCURRENCY) as executor:
+        # Ask Zoho how many pages exist while page 1 is in flight, so the
+        # fan-out can stop at the last page instead of paying for empty ones.
+        page_count = executor.submit(count_record_pages, path)
+        first_page = fetch_page(1)
+        if not has_more_records(first_page[1]):
+            return [first_page]
+
+        # Without a count, fan out to every requested page anyway;
+        # merge_record_pages stops at the first empty one.
+        last_page = page_count.result()
+        if last_page is not None:
+            pages = min(pages, last_page)
+        return [first_page] + list(executor.map(fetch_page, range(2, pages + 1)))
+
+
+def merge_record_pages(pages):
+    records = []
+    info = {}
+    for _, page_data in pages:
+        # Zoho answers 204 No Content for pages past the last record.
+        if page_data is None:
+            break
+        records.extend(page_data.get("data", []))
+        info = page_data.get("info", info)
+    return {"data": records, "info": info}
+
+
+def listing_cache_key(api_domain, module_api_name, fields_param, pages):
+    digest = hashlib.sha1(f"{api_domain}|{fields_param}".encode()).hexdigest()
+    return f"zoho:records:{module_api_name}:{digest}:{pages}"
+
+
+def json_body_response(body):
+    response = Response(body, mimetype="application/json")
+    response.set_etag(hashlib.sha1(body).hexdigest())
+    return response.make_conditional(request)
+
+
+def listing_response(cache_key, pages):
+    upstream, page_data = pages[0]
+    if len(pages) == 1 and upstream.status_code == 200 and page_data is None:
+        # Nothing to cache into, so pipe Zoho's body straight to the client.
+        if _REDIS is None:
+            response = Response(upstream.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+                                mimetype="application/json")
+            # Hand the pooled connection back even if the client hangs up mid-body.
+            response.call_on_close(upstream.close)
+            return response
+        body = upstream.content
+    else:
+        body = orjson.dumps(merge_record_pages(pages))
+        # A streamed 204 is never read, so release its connection explicitly.
+        for upstream, _ in pages:
+            upstream.close()
+
+    cache_set(cache_key, RESPONSE_CACHE_TTL, body)
+    return json_body_response(body)
+
+
+# The demo records never change, so encode them once at import.
+_CUSTOMER_PAYLOAD = orjson.dumps({"data": [{
+    "Name": "Rajalakshmi",
+    "Phone": "+919999999999",
+    "Email": "raji@example.com",
+    "Customer_ID": "1234",
+    "Cart_ID": 7890,
+    "Order_Date": "2025-05-22",
+    "Address": "123 Main Street, Chennai",
+    "Known_languages": "Tamil",
+    "Order_Status": "Order Placed"
+}]})
+
+
 @app.route("/create_customer", methods=["GET", "POST"])
 def create_customer():
-    access_token, err = refresh_access_token()
+    response, err = call_with_retry(
+        "POST", CUSTOMERS_PATH, headers=JSON_HEADERS, data=_CUSTOMER_PAYLOAD
+    )
     if err:
         return jsonify({"error": err}), 401
 
-    token_store = load_tokens()
-    api_domain = token_store.get("api_domain")
-    if not api_domain:
-        return jsonify({"error": "API domain missing. Please authenticate again."}), 401
-
-    customer_data = {
-        "Name": "Rajalakshmi",
-        "Phone": "+919999999999",
-        "Email": "raji@example.com",
-        "Customer_ID": "1234",
-        "Cart_ID": 7890,
-        "Order_Date": "2025-05-22",
-        "Address": "123 Main Street, Chennai",
-        "Known_languages": "Tamil",
-        "Order_Status": "Order Placed"
-    }
-
-    zoho_url = f"{api_domain}/crm/v3/Customers"
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json"
-    }
-    payload = {"data": [customer_data]}
-
-    response = requests.post(zoho_url, headers=headers, json=payload)
-
     if response.status_code not in [200, 201]:
         return jsonify({
             "error": "Failed to create customer",
@@ -176,80 +617,68 @@ def create_customer():
 
     return jsonify({
         "message": "Customer created successfully",
-        "zoho_response": response.json()
+        "zoho_response": orjson.loads(response.content)
     })
 
 
 @app.route("/customers")
 def get_customers():
-    access_token, err = refresh_access_token()
+    _, api_domain, err = get_access_token()
     if err:
         return jsonify({"error": err}), 401
 
-    token_store = load_tokens()
-    api_domain = token_store.get("api_domain")
-    if not api_domain:
-        return jsonify({"error": "API domain missing. Please authenticate again."}), 401
-
-    fields, err = get_module_fields(access_token, api_domain, "Customers")
+    fields_param, err = get_fields_param(api_domain, "Customers")
     if err:
         return jsonify({"error": "Failed to fetch fields", "details": err}), 500
 
-    fields_param = ",".join(fields)
+    pages = min(max(request.args.get("pages", 1, type=int), 1), MAX_PAGES)
 
-    zoho_url = f"{api_domain}/crm/v3/Customers"
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}"
-    }
-    params = {
-        "fields": fields_param,
-        "per_page": 10
-    }
-
-    response = requests.get(zoho_url, headers=headers, params=params)
+    cache_key = listing_cache_key(api_domain, "Customers", fields_param, pages)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return json_body_response(cached)
 
-    if response.status_code != 200:
-        return jsonify({
-            "error": "Failed to fetch customers",
-            "details": response.text,
-            "status_code": response.status_code
-        }), response.status_code
+    results = fetch_record_pages(CUSTOMERS_PATH, fields_param, pages)
 
-    return jsonify(response.json())
+    pages_fetched = []
+    for response, page_data, err in results:
+        if err:
+            return jsonify({"error": err}), 401
+        if response.status_code not in [200, 204]:
+            # A rejected field list usually means the module schema changed.
+            if response.status_code in [400, 401]:
+                invalidate_fields_param(api_domain, "Customers")
+            return jsonify({
+                "error": "Failed to fetch customers",
+                "details": response.text,
+                "status_code": response.status_code
+            }), response.status_code
+        pages_fetched.append((response, page_data))
+
+    return listing_response(cache_key, pages_fetched)
+
+
+_ORDER_PAYLOAD = orjson.dumps({"data": [{
+    "Name": "Test Order Alpha",
+    "Order_Date": "2025-05-21",
+    "Total_Amount": 199.99,
+    "Prescription_Added": True,
+    "Items_in_Cart": "Sample Item A, Sample Item B",
+    "Cart_ID_1": 12345,
+    "Lookup": {
+        "id": "839146000000568002"
+    }
+}]})
 
 
 @app.route("/create_order", methods=["GET", "POST"])
 def create_order():
-    access_token, err = refresh_access_token()
+    response, err = call_with_retry(
+        "POST", ORDERS_PATH, headers=JSON_HEADERS, data=_ORDER_PAYLOAD
+    )
     if err:
         return jsonify({"error": err}), 401
 
-    token_store = load_tokens()
-    api_domain = token_store.get("api_domain")
-    if not api_domain:
-        return jsonify({"error": "API domain missing. Please authenticate again."}), 401
-
-    order_data = {
-        "Name": "Test Order Alpha",
-        "Order_Date": "2025-05-21",
-        "Total_Amount": 199.99,
-        "Prescription_Added": True,
-        "Items_in_Cart": "Sample Item A, Sample Item B",
-        "Cart_ID_1": 12345,
-        "Lookup": {
-            "id": "839146000000568002" 
-        }
-    }
-
-    zoho_url = f"{api_domain}/crm/v3/Cart_Orders"
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json"
-    }
-    payload = {"data": [order_data]}
-
-    response = requests.post(zoho_url, headers=headers, json=payload)
-
     if response.status_code not in [200, 201]:
         return jsonify({
             "error": "Failed to create order",
@@ -259,47 +688,46 @@ def create_order():
 
     return jsonify({
         "message": "Dummy order created successfully",
-        "zoho_response": response.json()
+        "zoho_response": orjson.loads(response.content)
     })
 
 
 @app.route("/orders")
 def get_orders():
-    access_token, err = refresh_access_token()
+    _, api_domain, err = get_access_token()
     if err:
         return jsonify({"error": err}), 401
 
-    token_store = load_tokens()
-    api_domain = token_store.get("api_domain")
-    if not api_domain:
-        return jsonify({"error": "API domain missing. Please authenticate again."}), 401
-
-    fields, err = get_module_fields(access_token, api_domain, "Cart_Orders")
+    fields_param, err = get_fields_param(api_domain, "Cart_Orders")
     if err:
         return jsonify({"error": "Failed to fetch fields", "details": err}), 500
 
-    fields_param = ",".join(fields)
+    pages = min(max(request.args.get("pages", 1, type=int), 1), MAX_PAGES)
 
-    zoho_url = f"{api_domain}/crm/v3/Cart_Orders"
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}"
-    }
-    params = {
-        "fields": fields_param,
-        "per_page": 10
-    }
+    cache_key = listing_cache_key(api_domain, "Cart_Orders", fields_param, pages)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return json_body_response(cached)
 
-    response = requests.get(zoho_url, headers=headers, params=params)
+    results = fetch_record_pages(ORDERS_PATH, fields_param, pages)
 
-    if response.status_code != 200:
-        return jsonify({
-            "error": "Failed to fetch orders",
-            "details": response.text,
-            "status_code": response.status_code
-        }), response.status_code
+    pages_fetched = []
+    for response, page_data, err in results:
+        if err:
+            return jsonify({"error": err}), 401
+        if response.status_code not in [200, 204]:
+            # A rejected field list usually means the module schema changed.
+            if response.status_code in [400, 401]:
+                invalidate_fields_param(api_domain, "Cart_Orders")
+            return jsonify({
+                "error": "Failed to fetch orders",
+                "details": response.text,
+                "status_code": response.status_code
+            }), response.status_code
+        pages_fetched.append((response, page_data))
 
-    return jsonify(response.json())
+    return listing_response(cache_key, pages_fetched)
 
 
-if __name__ == "__main__":
-    app.run(debug=True)
+# Serve with gunicorn and gevent workers rather than the Werkzeug dev server:
+#     gunicorn -c gunicorn_conf.py wsgi:app
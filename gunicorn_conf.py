@@ -0,0 +1,10 @@
+import multiprocessing
+
+bind = "0.0.0.0:5000"
+
+# gevent workers multiplex many in-flight Zoho calls per process while they
+# wait on the network; wsgi.py patches the stdlib before the app is imported.
+worker_class = "gevent"
+workers = 2 * multiprocessing.cpu_count() + 1
+worker_connections = 1000
+keepalive = 75
@@ -0,0 +1,5 @@
+from gevent import monkey
+
+monkey.patch_all()
+
+from app import app  # noqa: E402